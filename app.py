@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import atexit
 import contextlib
 import csv
-import json
+import gc
+import gzip
+import math
+import mmap
+import os
 import random
+import secrets
+import sys
 import threading
-import uuid
+import time
 from pathlib import Path
-from typing import Callable, TypeVar, TypedDict
+from typing import IO, Any, Iterator, TypedDict
 
-from flask import Flask, jsonify, render_template, request
+import orjson
+from cachetools import TTLCache
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import JSONProvider
+from sortedcontainers import SortedKeyList
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 try:
@@ -22,6 +33,8 @@ MODELS_FILE = BASE_DIR / "models.csv"
 JOKES_FILE = BASE_DIR / "jokes.json"
 ELO_FILE = BASE_DIR / "elo_state.json"
 STATE_LOCK_FILE = ELO_FILE.with_suffix(".lock")
+WAL_FILE = ELO_FILE.with_suffix(".wal")
+CHECKPOINT_INTERVAL = 60.0
 BENCHMARK_EXPLANATION = (
     " Funny Arena pairs two jokes from the same category and lets you decide which model"
     " is funnier. Each click records a head-to-head result, updates the Elo"
@@ -31,11 +44,32 @@ BENCHMARK_EXPLANATION = (
     " Contribute at https://github.com/demegire/funny-arena"
 )
 
+
+class OrjsonProvider(JSONProvider):
+    """Serve jsonify() and request.get_json() through orjson instead of stdlib json."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Map the stdlib options orjson can honour; anything else would be
+        # silently ignored, so refuse it instead.
+        default = kwargs.pop("default", None)
+        option = orjson.OPT_SORT_KEYS if kwargs.pop("sort_keys", False) else 0
+        if kwargs:
+            raise TypeError(f"Unsupported orjson dumps() arguments: {', '.join(kwargs)}")
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            raise TypeError(f"Unsupported orjson loads() arguments: {', '.join(kwargs)}")
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_url_path="/funny-arena/static", static_folder="static")
+app.json = OrjsonProvider(app)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_prefix=1)
 lock = threading.Lock()
 state_thread_lock = threading.Lock()
-T = TypeVar("T")
+state_cache_lock = threading.RLock()
+LeaderboardEntry = dict[str, str | int | float]
 
 
 class EloState(TypedDict):
@@ -44,32 +78,70 @@ class EloState(TypedDict):
     total_votes: int
 
 
+class VoteRecord(TypedDict, total=False):
+    """One line of elo_state.wal: a win ("w" beat "l") or a draw ("d")."""
+
+    n: int  # total_votes after this vote; replay skips records already in the snapshot
+    w: str
+    l: str
+    d: list[str]
+
+
+_LOCK_HANDLES = threading.local()
+
+
+def _lock_handle() -> IO[str]:
+    # flock() locks belong to the open file description, so each thread keeps
+    # its own handle: shared locks from several threads then really are shared,
+    # while LOCK_EX still excludes other threads as well as other processes.
+    # The handle is reused across calls and reopened after a fork so workers
+    # never share their parent's description.
+    if getattr(_LOCK_HANDLES, "pid", None) != os.getpid():
+        _LOCK_HANDLES.handle = STATE_LOCK_FILE.open("a")
+        _LOCK_HANDLES.pid = os.getpid()
+    return _LOCK_HANDLES.handle
+
+
 @contextlib.contextmanager
-def _state_guard(shared: bool) -> None:
+def _state_guard(shared: bool) -> Iterator[None]:
     if fcntl is None:
         with state_thread_lock:
             yield
         return
 
-    STATE_LOCK_FILE.touch(exist_ok=True)
-    with STATE_LOCK_FILE.open("w") as handle:
-        flag = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
-        fcntl.flock(handle, flag)
-        try:
-            yield
-        finally:
-            fcntl.flock(handle, fcntl.LOCK_UN)
+    handle = _lock_handle()
+    flag = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    fcntl.flock(handle, flag)
+    try:
+        yield
+    finally:
+        fcntl.flock(handle, fcntl.LOCK_UN)
 
 
 def _load_models() -> list[str]:
     with MODELS_FILE.open() as handle:
         reader = csv.reader(handle)
-        return [row[0].strip() for row in reader if row]
-
-
-def _load_jokes() -> dict[str, dict[str, list[str]]]:
-    with JOKES_FILE.open() as handle:
-        return json.load(handle)
+        return [sys.intern(row[0].strip()) for row in reader if row]
+
+
+def _load_jokes() -> dict[str, dict[str, tuple[str, ...]]]:
+    # Parse straight out of a read-only mapping rather than copying the file into
+    # a bytes object first; with gunicorn's preload_app this runs once in the
+    # master and workers inherit the result. Names are interned so hot dict
+    # lookups hit the identity fast path, and repeated joke texts (models often
+    # tell the same classic) collapse onto a single string object.
+    with JOKES_FILE.open("rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped, memoryview(mapped) as view:
+        stored = orjson.loads(view)
+    seen: dict[str, str] = {}
+    return {
+        sys.intern(model): {
+            sys.intern(category): tuple(seen.setdefault(joke, joke) for joke in jokes)
+            for category, jokes in categories.items()
+        }
+        for model, categories in stored.items()
+    }
 
 
 MODELS = _load_models()
@@ -86,16 +158,32 @@ def _build_category_index() -> dict[str, list[str]]:
 
 
 CATEGORY_INDEX = _build_category_index()
-ACTIVE_BATTLES: dict[str, dict[str, str]] = {}
-
-
-def _load_state() -> EloState:
-    if ELO_FILE.exists():
-        with ELO_FILE.open() as handle:
-            stored = json.load(handle)
-    else:
-        stored = {}
-
+CATEGORIES_TUPLE: tuple[str, ...] = tuple(CATEGORY_INDEX)
+CATEGORY_MODELS: dict[str, tuple[str, ...]] = {
+    category: tuple(models) for category, models in CATEGORY_INDEX.items()
+}
+JOKE_POOL: dict[tuple[str, str], tuple[str, ...]] = {
+    (model, category): jokes
+    for model in MODELS
+    for category, jokes in JOKES.get(model, {}).items()
+}
+# Battles nobody votes on expire instead of piling up forever; guarded by `lock`.
+ACTIVE_BATTLES: TTLCache[str, dict[str, str]] = TTLCache(maxsize=10_000, ttl=600)
+
+# Process-wide copy of the Elo state. It is reloaded only when the snapshot or
+# the vote log changes on disk (another worker voted), so most requests never
+# touch the disk.
+_STATE_CACHE: EloState | None = None
+_STATE_VERSION: tuple[int, int, int] = (0, 0, 0)
+_LEADERBOARD_CACHE: list[LeaderboardEntry] | None = None
+# Serialised /api/leaderboard body as (json, gzipped json); dropped with the leaderboard.
+_LEADERBOARD_PAYLOAD: tuple[bytes, bytes] | None = None
+# (elo, model) pairs of the cached state, highest rating first. Kept in step
+# with the cached elos so a vote re-ranks two models instead of re-sorting.
+_RANKED: SortedKeyList = SortedKeyList(key=lambda item: -item[0])
+
+
+def _normalise_state(stored: dict) -> EloState:
     if "elos" in stored:
         elos = stored.get("elos", {})
         votes = stored.get("votes", {})
@@ -116,73 +204,311 @@ def _load_state() -> EloState:
     }
 
 
+def _read_wal() -> list[VoteRecord]:
+    try:
+        raw = WAL_FILE.read_bytes()
+    except FileNotFoundError:
+        return []
+    # Ignore a trailing line that a concurrent writer has not finished yet.
+    return [orjson.loads(line) for line in raw[: raw.rfind(b"\n") + 1].splitlines()]
+
+
+def _apply_vote(state: EloState, record: VoteRecord) -> None:
+    if "d" in record:
+        elo_draw(state["elos"], *record["d"])
+    else:
+        elo_update(state["elos"], record["w"], record["l"])
+        state["votes"][record["w"]] = state["votes"].get(record["w"], 0) + 1
+    state["total_votes"] += 1
+
+
+def _replay_wal(state: EloState) -> bool:
+    """Apply logged votes newer than the snapshot; False if the log has a gap."""
+    for record in _read_wal():
+        if record["n"] <= state["total_votes"]:
+            continue
+        if record["n"] != state["total_votes"] + 1:
+            return False
+        _apply_vote(state, record)
+    return True
+
+
+def _load_state() -> EloState | None:
+    """Return the snapshot plus logged votes, or None if they do not line up."""
+    # The file is normalised once by _bootstrap_state, so trust it as stored.
+    try:
+        state = orjson.loads(ELO_FILE.read_bytes())
+    except FileNotFoundError:
+        state = _normalise_state({})
+    return state if _replay_wal(state) else None
+
+
 def _save_state(state: EloState) -> None:
-    with ELO_FILE.open("w") as handle:
-        json.dump(state, handle, indent=2)
+    # orjson returns one contiguous buffer, so hand it to a single unbuffered
+    # write(); write to a sibling file and rename so readers never see a
+    # partial file.
+    tmp = ELO_FILE.with_suffix(".json.tmp")
+    with tmp.open("wb", buffering=0) as handle:
+        handle.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+    os.replace(tmp, ELO_FILE)
+
+
+def _wal_size() -> int:
+    try:
+        return WAL_FILE.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+_WAL_FD = -1
+_WAL_PID = 0
+
+
+def _append_wal(record: VoteRecord) -> None:
+    # One O_APPEND descriptor per process, like the lock handle.
+    global _WAL_FD, _WAL_PID
+    if _WAL_PID != os.getpid():
+        _WAL_FD = os.open(WAL_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        _WAL_PID = os.getpid()
+    os.write(_WAL_FD, orjson.dumps(record) + b"\n")
+
+
+def _bootstrap_state() -> None:
+    """Migrate legacy files, add defaults for new models and fold in the vote log."""
+    with _state_guard(shared=False):
+        raw = ELO_FILE.read_bytes() if ELO_FILE.exists() else b"{}"
+        state = _normalise_state(orjson.loads(raw))
+        if not _replay_wal(state):
+            raise RuntimeError(f"{WAL_FILE.name} does not continue {ELO_FILE.name}.")
+        if _wal_size() or not ELO_FILE.exists() or state != orjson.loads(raw):
+            _save_state(state)
+            if WAL_FILE.exists():
+                os.truncate(WAL_FILE, 0)
+
+
+def _state_version() -> tuple[int, int, int]:
+    try:
+        snapshot = ELO_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        snapshot = 0
+    try:
+        wal = WAL_FILE.stat()
+    except FileNotFoundError:
+        return snapshot, 0, 0
+    return snapshot, wal.st_size, wal.st_mtime_ns
+
+
+def _install_state(state: EloState, version: tuple[int, int, int]) -> None:
+    global _STATE_CACHE, _STATE_VERSION
+    _STATE_CACHE = state
+    _STATE_VERSION = version
+    _invalidate_leaderboard()
+    _RANKED.clear()
+    _RANKED.update((score, model) for model, score in state["elos"].items())
+
+
+def _refresh_state() -> EloState:
+    """Reload the cache from disk; callers must hold the state guard."""
+    version = _state_version()
+    with state_cache_lock:
+        if _STATE_CACHE is None or version != _STATE_VERSION:
+            state = _load_state()
+            if state is None:
+                raise RuntimeError(f"{WAL_FILE.name} does not continue {ELO_FILE.name}.")
+            _install_state(state, version)
+        return _STATE_CACHE
+
+
+def _refresh_state_unlocked() -> EloState | None:
+    """Reload without the file lock, or return None if the snapshot looks wrong.
+
+    Writers replace the snapshot atomically and only append whole lines to
+    the log, so an unlocked read sees some past state; a slightly stale
+    leaderboard is fine. A parse error, a gap between snapshot and log (a
+    checkpoint ran mid-read) or a vote total below the cached one sends the
+    caller to the locked path.
+    """
+    version = _state_version()
+    try:
+        state = _load_state()
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    with state_cache_lock:
+        if state is None or (
+            _STATE_CACHE is not None and state["total_votes"] < _STATE_CACHE["total_votes"]
+        ):
+            return None
+        _install_state(state, version)
+        return state
 
 
 def read_state() -> EloState:
+    with state_cache_lock:
+        if _STATE_CACHE is not None and _state_version() == _STATE_VERSION:
+            return _STATE_CACHE
+    state = _refresh_state_unlocked()
+    if state is not None:
+        return state
     with _state_guard(shared=True):
-        return _load_state()
+        return _refresh_state()
+
+
+def update_state(record: VoteRecord) -> tuple[int, list[LeaderboardEntry]]:
+    """Log a vote and apply it to the cached state.
 
+    Returns the vote total right after this vote together with the changed
+    leaderboard entries, both read while the state is still locked.
 
-def update_state(mutator: Callable[[EloState], T]) -> tuple[EloState, T]:
+    Only the short log line is written here; the full snapshot is rewritten
+    by checkpoint_state.
+    """
+    global _STATE_VERSION
+    _start_checkpointer()
     with _state_guard(shared=False):
-        state = _load_state()
-        result = mutator(state)
-        _save_state(state)
-        return state, result
-
-
-def build_leaderboard(
-    elos: dict[str, float], votes: dict[str, int]
-) -> list[dict[str, str | int | float]]:
-    ordered = sorted(elos.items(), key=lambda item: item[1], reverse=True)
-    leaderboard = []
-    for position, (model, score) in enumerate(ordered, start=1):
-        leaderboard.append(
-            {
-                "rank": position,
-                "model": model,
-                "elo": round(score, 1),
-                "votes": votes.get(model, 0),
-            }
-        )
-    return leaderboard
+        with state_cache_lock:
+            state = _refresh_state()
+            record["n"] = state["total_votes"] + 1
+            _append_wal(record)
+            changes = _record_vote(state, record)
+            _STATE_VERSION = _state_version()
+            return state["total_votes"], changes
+
+
+def checkpoint_state() -> None:
+    """Write the current state to elo_state.json and empty the vote log."""
+    global _STATE_VERSION
+    with _state_guard(shared=False):
+        with state_cache_lock:
+            state = _refresh_state()
+            if not _wal_size():
+                return
+            _save_state(state)
+            os.truncate(WAL_FILE, 0)
+            _STATE_VERSION = _state_version()
+
+
+_CHECKPOINT_PID = 0
+
+
+def _checkpoint_loop() -> None:
+    while True:
+        time.sleep(CHECKPOINT_INTERVAL)
+        try:
+            checkpoint_state()
+        except Exception:  # keep checkpointing after a transient failure
+            app.logger.exception("Failed to checkpoint Elo state")
+
+
+def _start_checkpointer() -> None:
+    # Threads do not survive fork, so each worker starts its own on first vote.
+    global _CHECKPOINT_PID
+    if _CHECKPOINT_PID != os.getpid():
+        _CHECKPOINT_PID = os.getpid()
+        threading.Thread(target=_checkpoint_loop, name="elo-checkpoint", daemon=True).start()
+
+
+def _invalidate_leaderboard() -> None:
+    global _LEADERBOARD_CACHE, _LEADERBOARD_PAYLOAD
+    with state_cache_lock:
+        _LEADERBOARD_CACHE = None
+        _LEADERBOARD_PAYLOAD = None
+
+
+def leaderboard_payload(state: EloState) -> tuple[bytes, bytes]:
+    """Return the /api/leaderboard body as plain and gzip-compressed JSON bytes."""
+    global _LEADERBOARD_PAYLOAD
+    with state_cache_lock:
+        if _LEADERBOARD_PAYLOAD is None:
+            body = orjson.dumps(
+                {
+                    "leaderboard": build_leaderboard(state),
+                    "explanation": BENCHMARK_EXPLANATION,
+                    "total_votes": state["total_votes"],
+                }
+            )
+            _LEADERBOARD_PAYLOAD = (body, gzip.compress(body, 6))
+        return _LEADERBOARD_PAYLOAD
+
+
+def _leaderboard_entry(
+    rank: int, score: float, model: str, votes: dict[str, int]
+) -> LeaderboardEntry:
+    return {
+        "rank": rank,
+        "model": model,
+        "elo": round(score, 1),
+        "votes": votes.get(model, 0),
+    }
+
+
+def build_leaderboard(state: EloState) -> list[LeaderboardEntry]:
+    """Return the ranked leaderboard, rebuilding it only after a vote or reload."""
+    global _LEADERBOARD_CACHE
+    with state_cache_lock:
+        if _LEADERBOARD_CACHE is None:
+            votes = state["votes"]
+            _LEADERBOARD_CACHE = [
+                _leaderboard_entry(position, score, model, votes)
+                for position, (score, model) in enumerate(_RANKED, start=1)
+            ]
+        return _LEADERBOARD_CACHE
+
+
+def _rank_positions(elos: dict[str, float], models: tuple[str, str]) -> list[int]:
+    return [_RANKED.index((elos[model], model)) for model in models]
+
+
+def _leaderboard_changes(
+    state: EloState, models: tuple[str, str], before: list[int]
+) -> list[LeaderboardEntry]:
+    """Entries for the rated models and every model ranked between their old and new spots."""
+    positions = before + _rank_positions(state["elos"], models)
+    start, stop = min(positions), max(positions) + 1
+    votes = state["votes"]
+    return [
+        _leaderboard_entry(position, score, model, votes)
+        for position, (score, model) in enumerate(_RANKED.islice(start, stop), start=start + 1)
+    ]
+
+
+_LN10_OVER_400 = math.log(10) / 400
+
+
+def _expected_score(rating: float, opponent: float) -> float:
+    # 1 / (1 + 10 ** ((opponent - rating) / 400)) with a single exp() call.
+    return 1.0 / (1.0 + math.exp((opponent - rating) * _LN10_OVER_400))
 
 
 def elo_update(elos: dict[str, float], winner: str, loser: str, k: float = 32.0) -> None:
     winner_rating = elos[winner]
     loser_rating = elos[loser]
-    expected_winner = 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400))
-    expected_loser = 1 / (1 + 10 ** ((winner_rating - loser_rating) / 400))
+    delta = k * (1.0 - _expected_score(winner_rating, loser_rating))
 
-    elos[winner] = winner_rating + k * (1 - expected_winner)
-    elos[loser] = loser_rating + k * (0 - expected_loser)
+    elos[winner] = winner_rating + delta
+    elos[loser] = loser_rating - delta
 
 
 def elo_draw(elos: dict[str, float], model_a: str, model_b: str, k: float = 32.0) -> None:
     rating_a = elos[model_a]
     rating_b = elos[model_b]
-    expected_a = 1 / (1 + 10 ** ((rating_b - rating_a) / 400))
-    expected_b = 1 / (1 + 10 ** ((rating_a - rating_b) / 400))
+    delta = k * (0.5 - _expected_score(rating_a, rating_b))
 
-    elos[model_a] = rating_a + k * (0.5 - expected_a)
-    elos[model_b] = rating_b + k * (0.5 - expected_b)
+    elos[model_a] = rating_a + delta
+    elos[model_b] = rating_b - delta
 
 
 def select_battle() -> dict[str, str | list[dict[str, str | int]]]:
     if not CATEGORY_INDEX:
         raise RuntimeError("No overlapping joke categories with at least two models.")
     state = read_state()
-    leaderboard = build_leaderboard(state["elos"], state["votes"])
+    leaderboard = build_leaderboard(state)
     rank_lookup = {entry["model"]: entry["rank"] for entry in leaderboard}
 
-    category = random.choice(list(CATEGORY_INDEX.keys()))
-    model_a, model_b = random.sample(CATEGORY_INDEX[category], 2)
+    category = random.choice(CATEGORIES_TUPLE)
+    model_a, model_b = random.sample(CATEGORY_MODELS[category], 2)
     contestants = []
     for model in (model_a, model_b):
-        joke = random.choice(JOKES[model][category])
+        joke = random.choice(JOKE_POOL[(model, category)])
         contestants.append(
             {
                 "id": model,
@@ -190,11 +516,16 @@ def select_battle() -> dict[str, str | list[dict[str, str | int]]]:
                 "rank": rank_lookup.get(model, "-"),
             }
         )
-    battle_id = str(uuid.uuid4())
-    ACTIVE_BATTLES[battle_id] = {"winner": None, "model_a": model_a, "model_b": model_b}
+    battle_id = secrets.token_urlsafe(12)
+    with lock:
+        ACTIVE_BATTLES[battle_id] = {"winner": None, "model_a": model_a, "model_b": model_b}
     return {"battle_id": battle_id, "category": category, "contestants": contestants}
 
 
+_bootstrap_state()
+atexit.register(checkpoint_state)
+
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -202,14 +533,14 @@ def index():
 
 @app.get("/api/leaderboard")
 def api_leaderboard():
-    state = read_state()
-    return jsonify(
-        {
-            "leaderboard": build_leaderboard(state["elos"], state["votes"]),
-            "explanation": BENCHMARK_EXPLANATION,
-            "total_votes": state["total_votes"],
-        }
-    )
+    body, compressed = leaderboard_payload(read_state())
+    if request.accept_encodings["gzip"] > 0:
+        response = Response(compressed, mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 @app.get("/api/battle")
@@ -232,42 +563,50 @@ def api_battle_result():
 
     with lock:
         battle = ACTIVE_BATTLES.pop(battle_id, None)
-        if not battle:
-            return jsonify({"error": "Battle expired or unknown."}), 400
-
-        contenders = {battle["model_a"], battle["model_b"]}
-        if draw:
-            state, leaderboard = update_state(
-                lambda elo_state: _record_draw_result(
-                    elo_state, battle["model_a"], battle["model_b"]
-                )
-            )
+    if not battle:
+        return jsonify({"error": "Battle expired or unknown."}), 400
+
+    model_a, model_b = battle["model_a"], battle["model_b"]
+    if draw:
+        total_votes, changes = update_state({"d": [model_a, model_b]})
+    else:
+        if winner == model_a:
+            loser = model_b
+        elif winner == model_b:
+            loser = model_a
         else:
-            if winner not in contenders:
-                return jsonify({"error": "Winner must be part of the battle."}), 400
+            return jsonify({"error": "Winner must be part of the battle."}), 400
+
+        total_votes, changes = update_state({"w": winner, "l": loser})
 
-            loser = (contenders - {winner}).pop()
-            state, leaderboard = update_state(
-                lambda elo_state: _record_battle_result(elo_state, winner, loser)
+    if request.args.get("full") == "1":
+        state = read_state()
+        with state_cache_lock:
+            return jsonify(
+                {"leaderboard": build_leaderboard(state), "total_votes": state["total_votes"]}
             )
+    return jsonify({"changes": changes, "total_votes": total_votes})
 
-    return jsonify({"leaderboard": leaderboard, "total_votes": state["total_votes"]})
 
+def _record_vote(state: EloState, record: VoteRecord) -> list[LeaderboardEntry]:
+    models = (record["d"][0], record["d"][1]) if "d" in record else (record["w"], record["l"])
+    elos = state["elos"]
+    before = _rank_positions(elos, models)
+    for model in models:
+        _RANKED.remove((elos[model], model))
+    _apply_vote(state, record)
+    for model in models:
+        _RANKED.add((elos[model], model))
+    _invalidate_leaderboard()
+    return _leaderboard_changes(state, models, before)
 
-def _record_battle_result(state: EloState, winner: str, loser: str) -> list[dict[str, str | int | float]]:
-    elo_update(state["elos"], winner, loser)
-    state["votes"][winner] = state["votes"].get(winner, 0) + 1
-    state["total_votes"] += 1
-    return build_leaderboard(state["elos"], state["votes"])
 
-
-def _record_draw_result(
-    state: EloState, model_a: str, model_b: str
-) -> list[dict[str, str | int | float]]:
-    elo_draw(state["elos"], model_a, model_b)
-    state["total_votes"] += 1
-    return build_leaderboard(state["elos"], state["votes"])
+# Everything loaded above lives for the whole process. Moving it out of the
+# collector's generations keeps GC passes from touching (and, under gunicorn's
+# preload_app, copying) the pages shared with forked workers.
+gc.freeze()
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py).
+    app.run(debug=os.environ.get("FLASK_DEV") == "1", host="0.0.0.0", port=5000)
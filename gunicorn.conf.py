@@ -0,0 +1,21 @@
+"""Gunicorn settings for production: run ``gunicorn app:app`` from the project root."""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# Import app.py once in the master so MODELS, JOKES and CATEGORY_INDEX are
+# shared copy-on-write with every worker instead of being loaded per worker.
+preload_app = True
+
+# Open battles live in process memory, so a vote must reach the worker that
+# served its battle. Scale with threads; only raise WEB_CONCURRENCY once
+# battles are stored somewhere all workers can see.
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", multiprocessing.cpu_count() * 2 + 1))
+
+# Worker heartbeats touch a temp file; keep them off a possibly slow disk.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
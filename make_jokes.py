@@ -1,22 +1,40 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import csv
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
 # Thread-safe lock for writing to file
 file_lock = threading.Lock()
 
+# Shared session so every request reuses pooled keep-alive connections
+# instead of doing a fresh TCP + TLS handshake per joke
+SESSION = requests.Session()
+SESSION.headers["Authorization"] = ""
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=None,  # POST is not retried by default
+        ),
+    ),
+)
+
 def fetch_jokes_for_category(model, category):
     """Fetch 3 jokes for a given model and category."""
     jokes = []
     for _ in range(3):
         try:
-            response = requests.post(
+            response = SESSION.post(
                 url="https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": "",
-                },
                 json={
                     "model": model,
                     "messages": [
@@ -32,24 +50,28 @@ def fetch_jokes_for_category(model, category):
             jokes.append(f"Error: {e}")
     return category, jokes
 
-def process_model(model, categories, data):
-    """Process all categories for a single model."""
-    data[model] = {}
-    
-    # Process categories for this model (could be parallelized further if needed)
-    for category in categories:
-        category_name, jokes = fetch_jokes_for_category(model, category)
+def process_category(model, category, data):
+    """Fetch the jokes for one (model, category) pair and store them."""
+    category_name, jokes = fetch_jokes_for_category(model, category)
+    with file_lock:
         data[model][category_name] = jokes
-    
-    print(f"Completed: {model}")
-    print(data[model])
-    
-    # Thread-safe file writing
+    return category_name
+
+def save_data(data, models, categories):
+    """Atomically write the collected jokes to jokes.json in roster order."""
     with file_lock:
-        with open('jokes.json', 'w', encoding="utf-8") as json_file:
-            json.dump(data, json_file, indent=4, ensure_ascii=False)
-    
-    return model
+        ordered = {
+            model: {c: data[model][c] for c in categories if c in data[model]}
+            for model in models
+        }
+    with open('jokes.json.tmp', 'wb') as json_file:
+        json_file.write(orjson.dumps(ordered, option=orjson.OPT_INDENT_2))
+    os.replace('jokes.json.tmp', 'jokes.json')
+
+def flush_periodically(data, models, categories, stop_event, interval=30):
+    """Persist progress every `interval` seconds until `stop_event` is set."""
+    while not stop_event.wait(interval):
+        save_data(data, models, categories)
 
 # Load models and categories
 with open('models.csv', 'r', encoding="utf-8") as csv_file:
@@ -61,19 +83,34 @@ with open('categories.csv', 'r', encoding="utf-8") as csv_file:
     categories = [i[0] for i in csv_content]
 
 # Shared data dictionary
-data = {}
+data = {model: {} for model in models}
 
-# Process models in parallel
-max_workers = 5  # Adjust based on API rate limits
+# Debounced writes: flush every 30s in the background and once at the end
+stop_flushing = threading.Event()
+flusher = threading.Thread(
+    target=flush_periodically,
+    args=(data, models, categories, stop_flushing),
+    daemon=True,
+)
+flusher.start()
+
+# Process every (model, category) pair in one pool so the worker count is a
+# global limit on in-flight API calls
+max_workers = 32  # Adjust based on API rate limits
 with ThreadPoolExecutor(max_workers=max_workers) as executor:
-    futures = {executor.submit(process_model, model, categories, data): model 
-               for model in models}
+    futures = {executor.submit(process_category, model, category, data): (model, category)
+               for model in models for category in categories}
     
     for future in as_completed(futures):
-        model = futures[future]
+        model, category = futures[future]
         try:
             future.result()
+            print(f"Completed: {model} / {category}")
         except Exception as e:
-            print(f"Model {model} generated an exception: {e}")
+            print(f"{model} / {category} generated an exception: {e}")
+
+stop_flushing.set()
+flusher.join()
+save_data(data, models, categories)
 
 print("All models processed!")
\ No newline at end of file
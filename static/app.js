@@ -111,11 +111,7 @@ async function handleVote(event) {
             body: JSON.stringify({ battle_id: state.battle.battle_id, winner: winnerId }),
         });
         if (response.ok) {
-            const data = await response.json();
-            state.leaderboard = data.leaderboard ?? [];
-            state.totalVotes = data.total_votes ?? state.totalVotes;
-            totalVotesEl.textContent = formatNumber(state.totalVotes);
-            renderLeaderboard();
+            applyVoteResult(await response.json());
         }
     } catch (error) {
         // Ignore, banner text already shows progress
@@ -141,11 +137,7 @@ async function handleDraw() {
             body: JSON.stringify({ battle_id: state.battle.battle_id, draw: true }),
         });
         if (response.ok) {
-            const data = await response.json();
-            state.leaderboard = data.leaderboard ?? [];
-            state.totalVotes = data.total_votes ?? state.totalVotes;
-            totalVotesEl.textContent = formatNumber(state.totalVotes);
-            renderLeaderboard();
+            applyVoteResult(await response.json());
         }
     } catch (error) {
         // Ignore network errors, banner already indicates progress
@@ -156,6 +148,23 @@ async function handleDraw() {
     }
 }
 
+function applyVoteResult(data) {
+    // The server only sends the entries whose rank or rating moved, relative to
+    // its own board. If anyone else voted since our last full load, our copy is
+    // stale and patching it would mis-rank rows, so fetch the whole board.
+    const changes = data.changes ?? [];
+    if (!state.leaderboard.length || data.total_votes !== state.totalVotes + 1) {
+        loadLeaderboard();
+        return;
+    }
+    const byModel = new Map(state.leaderboard.map((entry) => [entry.model, entry]));
+    changes.forEach((entry) => byModel.set(entry.model, entry));
+    state.leaderboard = [...byModel.values()].sort((a, b) => a.rank - b.rank);
+    state.totalVotes = data.total_votes ?? state.totalVotes;
+    totalVotesEl.textContent = formatNumber(state.totalVotes);
+    renderLeaderboard();
+}
+
 function revealModels(selectedId) {
     document.querySelectorAll(".joke-card").forEach((card) => {
         const label = card.querySelector(".assistant-label");